@@ -8,6 +8,15 @@ from crosshair.core_and_libs import NoTracing
 
 
 def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        'slow: marks symbolic-execution-heavy tests (deselect with -m "not slow")',
+    )
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): group tests that share global state onto one "
+        'pytest-xdist worker (run with -n auto --dist loadgroup)',
+    )
     if "-v" in argv or "-vv" in argv:
         set_debug(True)
 
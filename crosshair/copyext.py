@@ -12,6 +12,7 @@ from typing import Dict, Optional
 
 from crosshair.tracers import is_tracing
 from crosshair.util import debug
+from crosshair.util import in_debug
 
 _MISSING = object
 
@@ -24,16 +25,22 @@ class CopyMode(int, Enum):
 
 def deepcopyext(obj: object, mode: CopyMode, memo: Dict):
     assert not is_tracing()
-    debug(type(obj), mode)
+    # This runs once per reachable object; avoid even the debug() call unless
+    # verbose logging is on:
+    if in_debug():
+        debug(type(obj), mode)
     objid = id(obj)
     cpy = memo.get(objid, _MISSING)
     if cpy is _MISSING:
         if mode == CopyMode.REALIZE:
             cls = type(obj)
-            if hasattr(cls, "__ch_deep_realize__"):
-                cpy = obj.__ch_deep_realize__()  # type: ignore
-            elif hasattr(cls, "__ch_realize__"):
-                cpy = _deepconstruct(obj.__ch_realize__(), mode, memo)  # type: ignore
+            deep_realizer = getattr(cls, "__ch_deep_realize__", None)
+            if deep_realizer is not None:
+                cpy = deep_realizer(obj)
+            else:
+                realizer = getattr(cls, "__ch_realize__", None)
+                if realizer is not None:
+                    cpy = _deepconstruct(realizer(obj), mode, memo)
         if cpy is _MISSING:
             try:
                 cpy = _deepconstruct(obj, mode, memo)
@@ -341,7 +341,30 @@ def choose_type(space: StateSpace, from_type: Type) -> Type:
     raise CrosshairInternal
 
 
+_CONSTRUCTOR_SIGNATURE_CACHE: Dict[
+    Tuple[type, object, object], Optional[inspect.Signature]
+] = {}
+
+
 def get_constructor_signature(cls: Type) -> Optional[inspect.Signature]:
+    # Cached: this runs on every proxy creation, and signature reflection is
+    # (comparatively) expensive. The key includes __new__ and __init__ so that
+    # a signature reflected while the class is condition-patched isn't served
+    # after unpatching. (A plain lru_cache also trips mypy's Hashable check and
+    # would pin every analyzed class in memory for the life of the process.)
+    key = (cls, cls.__new__, cls.__init__)
+    try:
+        return _CONSTRUCTOR_SIGNATURE_CACHE[key]
+    except KeyError:
+        pass
+    sig = _get_constructor_signature(cls)
+    if len(_CONSTRUCTOR_SIGNATURE_CACHE) >= 1000:
+        _CONSTRUCTOR_SIGNATURE_CACHE.clear()
+    _CONSTRUCTOR_SIGNATURE_CACHE[key] = sig
+    return sig
+
+
+def _get_constructor_signature(cls: Type) -> Optional[inspect.Signature]:
     # pydantic sets __signature__ on the class, so we look for that as well as on
     # __init__ (see https://github.com/samuelcolvin/pydantic/pull/1034)
     if hasattr(cls, "__signature__"):
@@ -1306,7 +1329,15 @@ def _mutability_testing_hash(o: object) -> int:
     return typ.__hash__(o)
 
 
+# frozenset of exact types for O(1) probes on the fast path below:
+_ATOMIC_IMMUTABLE_TYPE_SET = frozenset(_ATOMIC_IMMUTABLE_TYPES) | {bool}
+
+
 def is_deeply_immutable(o: object) -> bool:
+    if type(o) in _ATOMIC_IMMUTABLE_TYPE_SET:
+        # Exact-type fast path: atomic values don't need the patched-hash
+        # probe (and skip the tracing context setup entirely).
+        return True
     with TracingOnly(PatchingModule({hash: _mutability_testing_hash})):
         # debug('entered patching context', COMPOSITE_TRACER.modules)
         try:
@@ -1,10 +1,10 @@
 import ast
-from collections import Counter
 import builtins
 import copy
+import difflib
 import enum
-import functools
 import random
+import sys
 import time
 import threading
 import traceback
@@ -22,6 +22,7 @@ from typing import (
     Tuple,
     Type,
     TypeVar,
+    Union,
     cast,
 )
 
@@ -40,52 +41,39 @@ from crosshair.condition_parser import ConditionExpr
 from crosshair.tracers import NoTracing
 
 
-@functools.total_ordering
-class MessageType(enum.Enum):
-    CONFIRMED = "confirmed"
+class MessageType(enum.IntEnum):
+    # The numeric values give the order in which messages override each other
+    # (for the same source file line).
+    # For exmaple, we prefer to report a False-returning postcondition
+    # (POST_FAIL) over an exception-raising postcondition (POST_ERR).
+    # Deriving from IntEnum makes comparisons C-level int compares rather
+    # than dict lookups in a custom __lt__.
+
+    CONFIRMED = 0
     # The postcondition returns True over all execution paths.
 
-    CANNOT_CONFIRM = "cannot_confirm"
+    CANNOT_CONFIRM = 1
     # The postcondition returns True over the execution paths that were
     # attwmpted.
 
-    PRE_UNSAT = "pre_unsat"
+    PRE_UNSAT = 2
     # No attempted execution path got past the precondition checks.
 
-    POST_ERR = "post_err"
+    POST_ERR = 3
     # The postcondition raised an exception for some input.
 
-    EXEC_ERR = "exec_err"
+    EXEC_ERR = 4
     # The body of the function raised an exception for some input.
 
-    POST_FAIL = "post_fail"
+    POST_FAIL = 5
     # The postcondition returned False for some input.
 
-    SYNTAX_ERR = "syntax_err"
+    SYNTAX_ERR = 6
     # Pre/post conditions could not be determined.
 
-    IMPORT_ERR = "import_err"
+    IMPORT_ERR = 7
     # The requested module could not be imported.
 
-    def __lt__(self, other):
-        return self._order[self] < self._order[other]
-
-
-MessageType._order = {  # type: ignore
-    # This is the order that messages override each other (for the same source
-    # file line).
-    # For exmaple, we prefer to report a False-returning postcondition
-    # (POST_FAIL) over an exception-raising postcondition (POST_ERR).
-    MessageType.CONFIRMED: 0,
-    MessageType.CANNOT_CONFIRM: 1,
-    MessageType.PRE_UNSAT: 2,
-    MessageType.POST_ERR: 3,
-    MessageType.EXEC_ERR: 4,
-    MessageType.POST_FAIL: 5,
-    MessageType.SYNTAX_ERR: 6,
-    MessageType.IMPORT_ERR: 7,
-}
-
 
 @dataclass(frozen=True)
 class AnalysisMessage:
@@ -94,22 +82,23 @@ class AnalysisMessage:
     filename: str
     line: int
     column: int
-    traceback: str
+    # The traceback is a rendering of the message's origin, not part of its
+    # identity; excluding it keeps long-string compares out of equality/hash:
+    traceback: str = field(compare=False)
     test_fn: Optional[str] = None
     condition_src: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # Messages for one file all carry the same path; intern it so the
+        # position-keyed grouping in MessageCollector compares pointers:
+        object.__setattr__(self, "filename", sys.intern(self.filename))
+
 
-@functools.total_ordering
-class VerificationStatus(enum.Enum):
+class VerificationStatus(enum.IntEnum):
     REFUTED = 0
     UNKNOWN = 1
     CONFIRMED = 2
 
-    def __lt__(self, other):
-        if self.__class__ is other.__class__:
-            return self.value < other.value
-        return NotImplemented
-
 
 @dataclass
 class CallAnalysis:
@@ -123,36 +112,85 @@ class CallAnalysis:
 HeapRef = z3.DeclareSort("HeapRef")
 SnapshotRef = NewType("SnapshotRef", int)
 
+# Heap values of these types can never change, so snapshots may share them
+# instead of deep-copying. (tuple and frozenset are absent on purpose: both
+# can hold mutable members - hashability does not imply immutability)
+_DEEPLY_IMMUTABLE_TYPES = frozenset(
+    [int, float, bool, complex, str, bytes, type(None)]
+)
+
 
 def model_value_to_python(value: z3.ExprRef) -> object:
-    if z3.is_real(value):
+    # Dispatch on the sort kind (a single int compare per case) rather than
+    # the z3.is_* predicates, each of which re-inspects the sort:
+    kind = value.sort().kind()
+    if kind == z3.Z3_REAL_SORT:
         return float(value.as_fraction())
-    elif z3.is_seq(value):
-        ret = []
+    elif kind == z3.Z3_SEQ_SORT:
+        ret: List[object] = []
+        append = ret.append
         while value.num_args() == 2:
-            ret.append(model_value_to_python(value.arg(0).arg(0)))
+            append(model_value_to_python(value.arg(0).arg(0)))
             value = value.arg(1)
         if value.num_args() == 1:
-            ret.append(model_value_to_python(value.arg(0)))
+            append(model_value_to_python(value.arg(0)))
         return ret
-    elif z3.is_int(value):
+    elif kind == z3.Z3_INT_SORT:
         return value.as_long()
     else:
         return ast.literal_eval(repr(value))
 
 
 def prefer_true(v: Any) -> bool:
-    if hasattr(v, "var") and z3.is_bool(v.var):
+    # real_getattr with a default: one lookup, no exception handling, and no
+    # chance of re-entering CrossHair's patched getattr.
+    var = real_getattr(v, "var", None)
+    if var is not None and z3.is_bool(var):
         space = context_statespace()
-        return space.choose_possible(v.var, favor_true=True)
+        return space.choose_possible(var, favor_true=True)
     else:
         return v
 
 
-class StateSpaceCounter(Counter):
+class StateSpaceCounter(dict):
+    # A stripped-down Counter: integer tallies keyed by VerificationStatus,
+    # None, or "realize_*" strings. Backing it with a plain dict avoids
+    # Counter's signed-count filtering, and the small method set below is
+    # everything the search tree actually uses.
+    # `iterations` is consulted in hot loops (e.g. short-circuiting
+    # heuristics); cache the sum and invalidate on mutation.
+    _iterations_cache: Optional[int] = None
+
+    def __missing__(self, key) -> int:
+        return 0
+
+    def __setitem__(self, key, value) -> None:
+        self._iterations_cache = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        self._iterations_cache = None
+        dict.__delitem__(self, key)
+
+    def update(self, other) -> None:  # type: ignore
+        # NOTE: sums counts, Counter-style - not dict-style replacement:
+        self._iterations_cache = None
+        get = self.get
+        setitem = dict.__setitem__
+        for k, v in other.items():
+            setitem(self, k, get(k, 0) + v)
+
+    def clear(self) -> None:
+        self._iterations_cache = None
+        dict.clear(self)
+
     @property
     def iterations(self) -> int:
-        return sum(self[s] for s in VerificationStatus) + self[None]
+        ret = self._iterations_cache
+        if ret is None:
+            ret = sum(self[s] for s in VerificationStatus) + self[None]
+            self._iterations_cache = ret
+        return ret
 
     @property
     def unknown_pct(self) -> float:
@@ -264,7 +302,7 @@ class SearchTreeNode(NodeLike):
     Abstract helper class for StateSpace.
     """
 
-    statehash: Optional[str] = None
+    statehash: Union[int, str, None] = None
     result: CallAnalysis = CallAnalysis()
     exhausted: bool = False
 
@@ -435,7 +473,7 @@ class ParallelNode(RandomizedBinaryPathNode):
             self._stats = negative.stats()
             return (negative.get_result(), True)
         # it's unclear whether we want to just add stats here:
-        self._stats = StateSpaceCounter(positive.stats() + negative.stats())
+        self._stats = _summed_stats(positive, negative)
         return merge_node_results(
             positive.get_result(),
             pos_exhausted and neg_exhausted,
@@ -446,6 +484,15 @@ class ParallelNode(RandomizedBinaryPathNode):
         return 1.0 if self.positive.is_exhausted() else self._false_probability
 
 
+def _summed_stats(positive: NodeLike, negative: NodeLike) -> StateSpaceCounter:
+    # Sum both children into one fresh counter. (`a.stats() + b.stats()`
+    # would allocate an intermediate Counter and then copy it again)
+    stats = StateSpaceCounter()
+    stats.update(positive.stats())
+    stats.update(negative.stats())
+    return stats
+
+
 def merge_node_results(
     left: CallAnalysis, exhausted: bool, node: NodeLike
 ) -> Tuple[CallAnalysis, bool]:
@@ -469,7 +516,8 @@ def merge_node_results(
     return (
         CallAnalysis(
             min(left.verification_status, right.verification_status),
-            list(left.messages) + list(right.messages),
+            # One allocation; a list-convert-and-concat would make three:
+            tuple(left.messages) + tuple(right.messages),
             precond_side.failing_precondition,
             precond_side.failing_precondition_reason,
         ),
@@ -480,20 +528,24 @@ def merge_node_results(
 class WorstResultNode(RandomizedBinaryPathNode):
     forced_path: Optional[bool] = None
 
-    def __init__(self, rand: random.Random, expr: z3.ExprRef, solver: z3.Solver):
+    def __init__(self, rand: random.Random, expr: z3.ExprRef, space: "StateSpace"):
         super().__init__(rand)
         notexpr = z3.Not(expr)
-        could_be_true = solver_is_sat(solver, expr)
-        could_be_false = solver_is_sat(solver, notexpr)
+        could_be_true = space.is_possible(expr)
+        could_be_false = space.is_possible(notexpr)
         if (not could_be_true) and (not could_be_false):
             debug(" *** Reached impossible code path *** ")
-            debug("Current solver state:\n", str(solver))
+            debug("Current solver state:\n", str(space.solver))
             raise CrosshairInternal("Reached impossible code path")
         elif not could_be_true:
             self.forced_path = False
         elif not could_be_false:
             self.forced_path = True
         self._expr = expr
+        self._expr_id = expr.get_id()
+        # Keep the negation built above; re-deriving it on every False-branch
+        # replay would cost another round-trip into the z3 AST constructors:
+        self._not_expr = notexpr
 
     def _is_exhausted(self):
         return (
@@ -534,7 +586,7 @@ class WorstResultNode(RandomizedBinaryPathNode):
         ):
             self._stats = negative.stats()
             return (negative.get_result(), exhausted)
-        self._stats = StateSpaceCounter(positive.stats() + negative.stats())
+        self._stats = _summed_stats(positive, negative)
         return merge_node_results(
             positive.get_result(), positive.is_exhausted(), negative
         )
@@ -543,13 +595,22 @@ class WorstResultNode(RandomizedBinaryPathNode):
 class ModelValueNode(WorstResultNode):
     condition_value: object = None
 
-    def __init__(self, rand: random.Random, expr: z3.ExprRef, solver: z3.Solver):
-        if not solver_is_sat(solver):
-            debug("Solver unexpectedly unsat; solver state:", solver.sexpr())
-            raise CrosshairInternal("Unexpected unsat from solver")
-        self.condition_value = solver.model().evaluate(expr, model_completion=True)
+    def __init__(self, rand: random.Random, expr: z3.ExprRef, space: "StateSpace"):
+        solver = space.solver
+        # Any model of the current assertions supplies a candidate value;
+        # when the cached one is still valid, no solver call is needed here
+        # (and the follow-up `expr == value` check hits the cache as well):
+        model = space._usable_cached_model()
+        if model is None:
+            if not solver_is_sat(solver):
+                debug("Solver unexpectedly unsat; solver state:", solver.sexpr())
+                raise CrosshairInternal("Unexpected unsat from solver")
+            model = solver.model()
+            space._cached_model = model
+            space._cached_model_assertion_count = len(solver.assertions())
+        self.condition_value = model.evaluate(expr, model_completion=True)
         self._stats_key = f"realize_{expr}" if z3.is_const(expr) else None
-        WorstResultNode.__init__(self, rand, expr == self.condition_value, solver)
+        WorstResultNode.__init__(self, rand, expr == self.condition_value, space)
 
     def compute_result(self, leaf_analysis: CallAnalysis) -> Tuple[CallAnalysis, bool]:
         stats_key = self._stats_key
@@ -584,6 +645,10 @@ class StateSpace:
         self.solver.set("smt.random-seed", 42)
         # self.solver.set('randomize', False)
         self.choices_made: List[SearchTreeNode] = []
+        # The most recent satisfying model, plus the number of solver
+        # assertions it is known to satisfy (for cheap revalidation):
+        self._cached_model: Optional[z3.ModelRef] = None
+        self._cached_model_assertion_count = 0
         self.heaps: List[List[Tuple[z3.ExprRef, Type, object]]] = [[]]
         self.next_uniq = 1
         self.is_detached = False
@@ -614,6 +679,9 @@ class StateSpace:
         node = self._search_position.simplify()
         if node.is_stem():
             return (StateSpaceCounter(), StateSpaceCounter())
+        # Keep the resolved node, so the upcoming decision on this position
+        # doesn't have to simplify through the stem again:
+        self._search_position = node
         assert isinstance(
             node, BinaryPathNode
         ), f"node {node} {node.is_stem()} is not a binarypathnode"
@@ -635,8 +703,42 @@ class StateSpace:
         self._search_position = next_node
         return ret
 
+    def _usable_cached_model(self) -> Optional[z3.ModelRef]:
+        """
+        Return the last satisfying model, if it still models the solver state.
+
+        Constraints may have been added (possibly by solver-sharing helpers
+        like the type repo) since the model was produced; the model remains
+        valid as long as it satisfies each of those newer assertions.
+        """
+        model = self._cached_model
+        if model is None:
+            return None
+        assertions = self.solver.assertions()
+        count = len(assertions)
+        checked = self._cached_model_assertion_count
+        if count != checked:
+            for i in range(checked, count):
+                if not z3.is_true(model.eval(assertions[i], model_completion=True)):
+                    self._cached_model = None
+                    return None
+            self._cached_model_assertion_count = count
+        return model
+
     def is_possible(self, expr: z3.ExprRef) -> bool:
-        return solver_is_sat(self.solver, expr)
+        # Counterexample reuse, as pioneered by KLEE: when the last model
+        # already satisfies `expr`, satisfiability is established with a
+        # model evaluation (microseconds) instead of a solver call
+        # (milliseconds). This resolves at least one branch polarity of
+        # nearly every decision for free.
+        model = self._usable_cached_model()
+        if model is not None and z3.is_true(model.eval(expr, model_completion=True)):
+            return True
+        ret = solver_is_sat(self.solver, expr)
+        if ret:
+            self._cached_model = self.solver.model()
+            self._cached_model_assertion_count = len(self.solver.assertions())
+        return ret
 
     def choose_possible(self, expr: z3.ExprRef, favor_true=False) -> bool:
         with NoTracing():
@@ -649,12 +751,15 @@ class StateSpace:
                 raise PathTimeout
             if self._search_position.is_stem():
                 node = self._search_position.grow_into(
-                    WorstResultNode(self._random, expr, self.solver)
+                    WorstResultNode(self._random, expr, self)
                 )
             else:
                 node = cast(WorstResultNode, self._search_position.simplify())
                 assert isinstance(node, WorstResultNode)
-                if not z3.eq(node._expr, expr):
+                # Z3 hash-conses ASTs, so a faithful replay produces the very
+                # same node and a cached-id compare settles the common case;
+                # z3.eq only runs as a structural double-check on mismatch:
+                if node._expr_id != expr.get_id() and not z3.eq(node._expr, expr):
                     debug(" *** Begin Not Deterministic Debug *** ")
                     debug("  Traceback: ", test_stack())
                     debug("Decision expression changed from:")
@@ -668,36 +773,52 @@ class StateSpace:
             node = self._search_position
             # NOTE: format_stack() is more human readable, but it pulls source file contents,
             # so it is (1) slow, and (2) unstable when source code changes while we are checking.
-            statedesc = "\n".join(map(str, traceback.extract_stack(limit=8)))
+            statedesc: Union[int, str]
+            if in_debug():
+                # A readable description, so mismatches can be diffed below:
+                statedesc = "\n".join(map(str, traceback.extract_stack(limit=8)))
+            else:
+                # The same stack fingerprint as an integer hash; this skips
+                # the FrameSummary construction and string formatting that
+                # dominate extract_stack():
+                frame: Any = sys._getframe(1)
+                stathash = 0
+                for _ in range(8):
+                    if frame is None:
+                        break
+                    stathash = (stathash * 1000003) ^ hash(
+                        (frame.f_code, frame.f_lasti)
+                    )
+                    frame = frame.f_back
+                statedesc = stathash
             assert isinstance(node, SearchTreeNode)
             if node.statehash is None:
                 node.statehash = statedesc
             else:
                 if node.statehash != statedesc:
                     debug(" *** Begin Not Deterministic Debug *** ")
-                    debug("     First state: ", len(node.statehash))
-                    debug(node.statehash)
-                    debug("     Current state: ", len(statedesc))
-                    debug(statedesc)
-                    debug("     Decision points prior to this:")
-                    for choice in self.choices_made:
-                        debug("      ", choice)
-                    debug("     Stack Diff: ")
-                    import difflib
-
-                    debug(
-                        "\n".join(
-                            difflib.context_diff(
-                                node.statehash.split("\n"), statedesc.split("\n")
+                    if isinstance(node.statehash, str) and isinstance(statedesc, str):
+                        debug("     First state: ", len(node.statehash))
+                        debug(node.statehash)
+                        debug("     Current state: ", len(statedesc))
+                        debug(statedesc)
+                        debug("     Decision points prior to this:")
+                        for choice in self.choices_made:
+                            debug("      ", choice)
+                        debug("     Stack Diff: ")
+                        debug(
+                            "\n".join(
+                                difflib.context_diff(
+                                    node.statehash.split("\n"), statedesc.split("\n")
+                                )
                             )
                         )
-                    )
                     debug(" *** End Not Deterministic Debug *** ")
                     raise NotDeterministic()
             choose_true, stem = node.choose(favor_true=favor_true)
             self.choices_made.append(node)
             self._search_position = stem
-            chosen_expr = expr if choose_true else z3.Not(expr)
+            chosen_expr = node._expr if choose_true else node._not_expr
             if in_debug() and chosen_expr not in self._already_logged:
                 self._already_logged.add(chosen_expr)
                 debug("SMT chose:", chosen_expr)
@@ -709,7 +830,7 @@ class StateSpace:
             while True:
                 if self._search_position.is_stem():
                     self._search_position = self._search_position.grow_into(
-                        ModelValueNode(self._random, expr, self.solver)
+                        ModelValueNode(self._random, expr, self)
                     )
                 node = self._search_position.simplify()
                 if not isinstance(node, ModelValueNode):
@@ -722,7 +843,8 @@ class StateSpace:
                 self.choices_made.append(node)
                 self._search_position = next_node
                 if chosen:
-                    self.solver.add(expr == node.condition_value)
+                    # node._expr is the cached `expr == node.condition_value`:
+                    self.solver.add(node._expr)
                     ret = model_value_to_python(node.condition_value)
                     if (
                         in_debug()
@@ -734,7 +856,7 @@ class StateSpace:
                         debug("Realized at", test_stack())
                     return ret
                 else:
-                    self.solver.add(expr != node.condition_value)
+                    self.solver.add(node._not_expr)
 
     def find_model_value_for_function(self, expr: z3.ExprRef) -> object:
         if not solver_is_sat(self.solver):
@@ -751,12 +873,31 @@ class StateSpace:
         return SnapshotRef(len(self.heaps) - 1)
 
     def checkpoint(self):
+        # Share one deepcopy memo across the whole layer: objects reachable
+        # from several heap entries are copied only once, and aliasing among
+        # entries survives the snapshot (per-entry memos would both re-copy
+        # the shared substructure and silently sever the aliasing).
+        memo: Dict = {}
         self.heaps.append(
-            [(ref, typ, copy.deepcopy(val)) for (ref, typ, val) in self.heaps[-1]]
+            [
+                (
+                    ref,
+                    typ,
+                    val
+                    if type(val) in _DEEPLY_IMMUTABLE_TYPES
+                    else copy.deepcopy(val, memo),
+                )
+                for (ref, typ, val) in self.heaps[-1]
+            ]
         )
 
     def add_value_to_heaps(self, ref: z3.ExprRef, typ: Type, value: object) -> None:
         # TODO: needs more testing
+        if type(value) in _DEEPLY_IMMUTABLE_TYPES:
+            # Immutable values are safe to share across snapshot layers:
+            for heap in self.heaps:
+                heap.append((ref, typ, value))
+            return
         for heap in self.heaps[:-1]:
             heap.append((ref, typ, copy.deepcopy(value)))
         self.heaps[-1].append((ref, typ, value))
@@ -770,7 +911,25 @@ class StateSpace:
     ) -> object:
         with NoTracing():
             # TODO: needs more testing
-            for (curref, curtyp, curval) in self.heaps[snapshot]:
+            heap = self.heaps[snapshot]
+            # Z3 hash-conses ASTs, so a repeated lookup usually carries the
+            # very same ref node. Equality is then a tautology, and the fork
+            # below would be forced anyway; matching on the AST id first
+            # skips one solver query per compatible heap entry:
+            ref_id = ref.get_id()
+            for (curref, curtyp, curval) in heap:
+                if curref.get_id() == ref_id and dynamic_typing.unify(curtyp, typ):
+                    debug(
+                        "HEAP key lookup ",
+                        ref,
+                        ": Found existing (syntactic). ",
+                        "type:",
+                        name_of_type(type(curval)),
+                        "id:",
+                        id(curval) % 1000,
+                    )
+                    return curval
+            for (curref, curtyp, curval) in heap:
                 could_match = dynamic_typing.unify(curtyp, typ)
                 if not could_match:
                     continue
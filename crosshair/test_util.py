@@ -2,7 +2,18 @@ from copy import deepcopy
 from dataclasses import replace
 from dataclasses import dataclass
 import pathlib
-from typing import Callable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from typing import (
+    cast,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from crosshair.core import analyze_function
 from crosshair.core import deep_realize
@@ -103,8 +114,29 @@ def check_ok(
     return (messages, [])
 
 
-def check_messages(checkables: Iterable[Checkable], **kw) -> ComparableLists:
-    msgs = run_checkables(checkables)
+def assert_check_ok(
+    fn: Callable, optionset: AnalysisOptionSet = AnalysisOptionSet()
+) -> None:
+    """Assert that analysis produces no messages beyond confirmations."""
+    local_opts = AnalysisOptionSet(per_condition_timeout=10, per_path_timeout=5)
+    options = local_opts.overlay(optionset)
+    messages = [
+        message
+        for message in run_checkables(analyze_function(fn, options))
+        if message.state != MessageType.CONFIRMED
+    ]
+    assert messages == []
+
+
+def check_messages(
+    checkables: Iterable[Union[Checkable, AnalysisMessage]], **kw
+) -> ComparableLists:
+    inputs = list(checkables)
+    if inputs and isinstance(inputs[0], AnalysisMessage):
+        # Accept messages that have already been run (e.g. memoized results).
+        msgs = cast(List[AnalysisMessage], inputs)
+    else:
+        msgs = run_checkables(cast(List[Checkable], inputs))
     if kw.get("state") != MessageType.CONFIRMED:
         # Normally, ignore confirmation messages:
         msgs = [m for m in msgs if m.state != MessageType.CONFIRMED]
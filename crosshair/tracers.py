@@ -407,6 +407,11 @@ class NoTracing:
     variable.
     """
 
+    # An instance is created for every symbolic decision; __slots__ keeps that
+    # allocation small. (a shared singleton instance would not be safe: these
+    # contexts nest, and the enter-state below lives on the instance)
+    __slots__ = ("had_tracing", "undo")
+
     def __enter__(self):
         # Immediately disable tracing so that we don't trace this body either
         _getframe(0).f_trace = None
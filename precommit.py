@@ -186,7 +186,9 @@ def main() -> int:
             "--ignore-glob=crosshair/examples/*/*",
         ]
         if not args.noparallel:
-            test_cmd += ["-n", "auto"]
+            # loadgroup keeps tests marked xdist_group("...") on one worker;
+            # some tests mutate process-global state (patching, type repo).
+            test_cmd += ["-n", "auto", "--dist", "loadgroup"]
 
         subprocess.check_call(test_cmd, cwd=str(repo_root), env=env)
     else: